@@ -27,10 +27,9 @@ REGRAS DO JOGO DA VIDA:
 
 FUNCIONALIDADES:
     ✓ Grid adaptativo baseado no tamanho da tela
-    ✓ Sistema de renderização otimizado (renderiza apenas mudanças)
+    ✓ Sistema de renderização otimizado (só os blocos alterados são redesenhados)
     ✓ Geração aleatória de padrões iniciais
     ✓ Biblioteca de padrões clássicos (Glider, Pulsar, Spaceship, etc.)
-    ✓ Células com atributos individuais (linha, coluna, estado)
     ✓ Performance otimizada para 60+ FPS
     ✓ Linhas de grade visuais opcionais
 
@@ -59,24 +58,55 @@ INSTRUÇÕES DE USO:
     3. Para usar padrões específicos, modifique no __init__:
        self.load_pattern('glider', 10, 10)
     
-    4. Ajuste a velocidade modificando o valor em self.root.after()
+    4. Ajuste a velocidade com FullScreenGrid(target_ms=...)
     
     5. Ajuste a densidade inicial em create_random_pattern(density=0.3)
 
 PARÂMETROS CONFIGURÁVEIS:
     cell_size   - Tamanho de cada célula em pixels (padrão: 10)
     density     - Densidade de células vivas iniciais (0.0 a 1.0)
-    after_delay - Intervalo entre gerações em ms (padrão: 100)
+    target_ms   - Duração alvo de cada geração em ms; o tempo gasto no passo é
+                  descontado do agendamento (padrão: 100)
+    renderer    - Renderização: 'image' (PhotoImage) ou 'rects' (retângulos
+                  pré-alocados) (padrão: 'image')
+    sparse_density - Densidade acima da qual o passo deixa o conjunto esparso
+                  de células vivas; ele só é ativado abaixo da metade desse
+                  valor, evitando alternar a cada geração (padrão: 0.01;
+                  0 desativa)
+    grid_lines  - Desenha as linhas de grade (padrão: True)
+    backend     - Motor de cálculo: 'python', 'numpy', 'numba', 'packed',
+                  'avx2' (extensão C, ver life_avx2.c) ou 'cupy' (GPU)
+                  (padrão: 'numba' se o Numba estiver instalado, senão 'numpy')
 
 OTIMIZAÇÕES IMPLEMENTADAS:
-    • Uso de __slots__ para reduzir uso de memória
-    • Renderização diferencial (apenas células alteradas)
-    • Dicionário esparso para células vivas
-    • Matriz 2D para cálculo eficiente de vizinhos
+    • Estado único em matriz NumPy (sem objetos Cell por célula)
+    • Um único PhotoImage persistente: só os blocos com mudanças são enviados
+      ao Tk, e uma geração sem mudanças não desenha nada
+    • Pool de retângulos pré-alocados (apenas a cor muda, sem create/delete)
+    • Um único update_idletasks por geração, após aplicar todas as mudanças
+    • Mudanças extraídas com XOR + np.flatnonzero (índices lineares, sem argwhere)
+    • Matriz NumPy (uint8) com contagem vetorizada de vizinhos
+    • Dois buffers persistentes alternados a cada geração (sem alocar o grid)
+    • Borda (halo) de zeros ao redor do grid: vizinhança sem checagem de limites
+    • Conjunto esparso de células vivas para populações baixas (O(vivas))
+    • Stencil compilado com Numba (@njit paralelo, linhas divididas entre núcleos)
+    • Regra aplicada sem desvios: (n == 3) | ((n == 2) & viva)
+    • Varredura em blocos de 32×128 células com soma de colunas reaproveitada
+      entre linhas: n = col[c-1] + col[c] + col[c+1] - célula
+    • Kernel Numba especializado para o (rows, cols) da tela (limites constantes),
+      compilado na inicialização
+    • Mapa de blocos ativos (32×128): regiões paradas não são recalculadas, nem
+      entram na diferença renderizada ou na contagem da população
+    • Grid empacotado em bits (uint64) com contagem SWAR compilada pelo Numba;
+      o estado fica nas palavras e só as palavras alteradas voltam ao grid
+    • Extensão C opcional com AVX2: 256 células por operação (via ctypes), com
+      o mesmo estado em bits e escrita só das palavras alteradas
+    • Motor em GPU com CuPy: só os índices alterados voltam para a CPU
+    • Linhas de grade pré-renderizadas em uma única imagem de fundo
+    • Agendamento adaptativo: o atraso do root.after desconta o custo do passo
     • Canvas otimizado sem bordas ou highlights
 
 ESTRUTURA DE CLASSES:
-    Cell            - Representa uma célula individual do grid
     FullScreenGrid  - Gerencia o grid, lógica e renderização
 
 APLICAÇÕES EDUCACIONAIS:
@@ -114,21 +144,295 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import base64
+import ctypes
+import os
+import time
 import tkinter as tk
-import random
+from collections import defaultdict
 
+import numpy as np
 
-class Cell:
-    __slots__ = ['row', 'col', 'alive']
-    
-    def __init__(self, row: int, col: int):
-        self.row = row
-        self.col = col
-        self.alive = False
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import cupy as cp
+    HAS_CUPY = True
+except ImportError:
+    cp = None
+    HAS_CUPY = False
+
+
+def _load_avx2():
+    name = 'life_avx2.dll' if os.name == 'nt' else 'life_avx2.so'
+    try:
+        lib = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), name))
+    except OSError:
+        return None
+    lib.step_avx2.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+    lib.step_avx2.restype = ctypes.c_int
+    lib.apply_diff.argtypes = [ctypes.c_void_p] * 4 + [ctypes.c_int] * 3 + [ctypes.POINTER(ctypes.c_int64)]
+    lib.apply_diff.restype = ctypes.c_int64
+    return lib
+
+
+_avx2 = _load_avx2()
+HAS_AVX2 = _avx2 is not None
+
+
+BACKENDS = ('python', 'numpy', 'numba', 'packed', 'avx2', 'cupy')
+RENDERERS = ('image', 'rects')
+
+SPARSE_DENSITY = 0.01
+_SPARSE_ENTER = 0.5
+
+_GRID_GRAY = 190
+
+_PATTERNS = {
+    'glider': ((0,1), (1,2), (2,0), (2,1), (2,2)),
+    'blinker': ((0,0), (0,1), (0,2)),
+    'block': ((0,0), (0,1), (1,0), (1,1)),
+    'toad': ((0,1), (0,2), (0,3), (1,0), (1,1), (1,2)),
+    'spaceship': ((0,1), (0,4), (1,0), (2,0), (2,4), (3,0), (3,1), (3,2), (3,3)),
+    'beacon': ((0,0), (0,1), (1,0), (2,3), (3,2), (3,3)),
+    'pulsar': (
+        (0,2), (0,3), (0,4), (0,8), (0,9), (0,10),
+        (2,0), (2,5), (2,7), (2,12),
+        (3,0), (3,5), (3,7), (3,12),
+        (4,0), (4,5), (4,7), (4,12),
+        (5,2), (5,3), (5,4), (5,8), (5,9), (5,10),
+        (7,2), (7,3), (7,4), (7,8), (7,9), (7,10),
+        (8,0), (8,5), (8,7), (8,12),
+        (9,0), (9,5), (9,7), (9,12),
+        (10,0), (10,5), (10,7), (10,12),
+        (12,2), (12,3), (12,4), (12,8), (12,9), (12,10),
+    ),
+    'pentadecathlon': (
+        (0,2), (1,2), (2,1), (2,3), (3,2), (4,2), (5,2), (6,2), (7,1), (7,3), (8,2), (9,2)
+    ),
+    'glider_gun': (
+        (0,24), (1,22), (1,24), (2,12), (2,13), (2,20), (2,21), (2,34), (2,35),
+        (3,11), (3,15), (3,20), (3,21), (3,34), (3,35), (4,0), (4,1), (4,10),
+        (4,16), (4,20), (4,21), (5,0), (5,1), (5,10), (5,14), (5,16), (5,17),
+        (5,22), (5,24), (6,10), (6,16), (6,24), (7,11), (7,15), (8,12), (8,13)
+    ),
+}
+
+_NEIGHBORS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+_ONE = np.uint64(1)
+_LAST = np.uint64(63)
+_ZERO = np.uint64(0)
+
+_TILE_ROWS = 32
+_TILE_COLS = 128
+
+
+def step_numpy(grid, out):
+    n = (grid[:-2, :-2] + grid[:-2, 1:-1] + grid[:-2, 2:]
+         + grid[1:-1, :-2] + grid[1:-1, 2:]
+         + grid[2:, :-2] + grid[2:, 1:-1] + grid[2:, 2:])
+    out[1:-1, 1:-1] = (n == 3) | ((n == 2) & grid[1:-1, 1:-1])
+
+
+@njit(inline='always', boundscheck=False)
+def _step_block(grid, out, row_start, row_end, col_start, col_end):
+    width = col_end - col_start + 2
+    col_sum = np.empty(width, dtype=np.int32)
+    for k in range(width):
+        col = col_start - 1 + k
+        col_sum[k] = grid[row_start - 1, col] + grid[row_start, col] + grid[row_start + 1, col]
+
+    changed = False
+    delta = 0
+    for row in range(row_start, row_end):
+        if row > row_start:
+            for k in range(width):
+                col = col_start - 1 + k
+                col_sum[k] = col_sum[k] + grid[row + 1, col] - grid[row - 2, col]
+        for col in range(col_start, col_end):
+            k = col - col_start + 1
+            n = col_sum[k - 1] + col_sum[k] + col_sum[k + 1] - grid[row, col]
+            old = grid[row, col] == 1
+            new = (n == 3) | (old & (n == 2))
+            out[row, col] = new
+            changed |= new != old
+            delta += np.int32(new) - np.int32(old)
+    return changed, delta
+
+
+@njit(inline='always', boundscheck=False)
+def _near_active(active, tile_row, tile_col):
+    tile_rows, tile_cols = active.shape
+    for tr in range(max(tile_row - 1, 0), min(tile_row + 2, tile_rows)):
+        for tc in range(max(tile_col - 1, 0), min(tile_col + 2, tile_cols)):
+            if active[tr, tc]:
+                return True
+    return False
+
+
+def tile_shape(rows, cols):
+    return (max(rows - 2, 0) + _TILE_ROWS - 1) // _TILE_ROWS, (max(cols - 2, 0) + _TILE_COLS - 1) // _TILE_COLS
+
+
+def make_step(rows, cols):
+    tile_rows, tile_cols = tile_shape(rows, cols)
+
+    @njit(parallel=True, boundscheck=False)
+    def step_fixed(grid, out, active, next_active, tile_delta):
+        for tile_row in prange(tile_rows):
+            row_start = 1 + tile_row * _TILE_ROWS
+            row_end = min(row_start + _TILE_ROWS, rows - 1)
+            for tile_col in range(tile_cols):
+                if not _near_active(active, tile_row, tile_col):
+                    next_active[tile_row, tile_col] = False
+                    tile_delta[tile_row, tile_col] = 0
+                    continue
+                col_start = 1 + tile_col * _TILE_COLS
+                col_end = min(col_start + _TILE_COLS, cols - 1)
+                changed, delta = _step_block(grid, out, row_start, row_end, col_start, col_end)
+                next_active[tile_row, tile_col] = changed
+                tile_delta[tile_row, tile_col] = delta
+
+    return step_fixed
+
+
+@njit(cache=True, boundscheck=False)
+def collect_changes(new, old, active, changes):
+    rows, cols = new.shape
+    tile_rows, tile_cols = active.shape
+    count = 0
+    for tile_row in range(tile_rows):
+        row_start = 1 + tile_row * _TILE_ROWS
+        row_end = min(row_start + _TILE_ROWS, rows - 1)
+        for tile_col in range(tile_cols):
+            if not active[tile_row, tile_col]:
+                continue
+            col_start = 1 + tile_col * _TILE_COLS
+            col_end = min(col_start + _TILE_COLS, cols - 1)
+            for row in range(row_start, row_end):
+                for col in range(col_start, col_end):
+                    if new[row, col] != old[row, col]:
+                        changes[count] = row * cols + col
+                        count += 1
+    return count
+
+
+def packed_shape(rows, cols):
+    return rows, (cols + 63) // 64
+
+
+def pack_grid(grid, bits):
+    packed = np.packbits(grid[1:-1, 1:-1], axis=1, bitorder='little')
+    np.copyto(bits.view(np.uint8)[:, :packed.shape[1]], packed)
+
+
+@njit(cache=True)
+def apply_word_diff(new_bits, bits, grid, changes):
+    rows, words = bits.shape
+    width = grid.shape[1]
+    count = 0
+    delta = 0
+    for row in range(rows):
+        for word in range(words):
+            diff = new_bits[row, word] ^ bits[row, word]
+            if diff == _ZERO:
+                continue
+            new = new_bits[row, word]
+            base = (row + 1) * width + word * 64 + 1
+            for bit in range(64):
+                shift = np.uint64(bit)
+                if (diff >> shift) & _ONE:
+                    alive = np.uint8((new >> shift) & _ONE)
+                    grid.flat[base + bit] = alive
+                    changes[count] = base + bit
+                    count += 1
+                    delta += 2 * np.int64(alive) - 1
+    return count, delta
+
+
+@njit(cache=True)
+def _full_add(x, y, z):
+    partial = x ^ y
+    return partial ^ z, (x & y) | (z & partial)
+
+
+@njit(cache=True)
+def _row_planes(bits, row, word):
+    rows, words = bits.shape
+    if row < 0 or row >= rows:
+        return _ZERO, _ZERO, _ZERO
+    mid = bits[row, word]
+    prev = bits[row, word - 1] if word > 0 else _ZERO
+    nxt = bits[row, word + 1] if word + 1 < words else _ZERO
+    west = (mid << _ONE) | (prev >> _LAST)
+    east = (mid >> _ONE) | (nxt << _LAST)
+    return west, mid, east
+
+
+@njit(cache=True)
+def step_packed(bits, out, cols):
+    rows, words = bits.shape
+    tail = cols - (words - 1) * 64
+    tail_mask = (_ONE << np.uint64(tail)) - _ONE if tail < 64 else ~_ZERO
+    for row in range(rows):
+        for word in range(words):
+            aw, a, ae = _row_planes(bits, row - 1, word)
+            bw, b, be = _row_planes(bits, row, word)
+            cw, c, ce = _row_planes(bits, row + 1, word)
+
+            sum_a, carry_a = _full_add(aw, a, ae)
+            sum_c, carry_c = _full_add(cw, c, ce)
+            sum_b = bw ^ be
+            carry_b = bw & be
+
+            ones, carry_1 = _full_add(sum_a, sum_b, sum_c)
+            partial, carry_2 = _full_add(carry_a, carry_b, carry_c)
+            twos = partial ^ carry_1
+            fours = carry_2 | (partial & carry_1)
+
+            out[row, word] = twos & ~fours & (ones | b)
+        out[row, words - 1] &= tail_mask
+
+
+def step_avx2(bits, out, cols):
+    rows, words = bits.shape
+    if _avx2.step_avx2(bits.ctypes.data, out.ctypes.data, words, rows) != 0:
+        raise RuntimeError(f"step_avx2 rejected a grid of shape {bits.shape}")
+    tail = cols - (words - 1) * 64
+    if tail < 64:
+        out[:, -1] &= (_ONE << np.uint64(tail)) - _ONE
+
+
+def apply_word_diff_avx2(new_bits, bits, grid, changes):
+    rows, words = bits.shape
+    delta = ctypes.c_int64()
+    count = _avx2.apply_diff(new_bits.ctypes.data, bits.ctypes.data, grid.ctypes.data, changes.ctypes.data,
+                             words, rows, grid.shape[1] - 2, ctypes.byref(delta))
+    if count < 0:
+        raise RuntimeError(f"apply_diff rejected a grid of shape {bits.shape}")
+    return count, delta.value
+
+
+def ppm_data(image):
+    height, width = image.shape
+    header = f"P5 {width} {height} 255\n".encode()
+    return base64.b64encode(header + image.tobytes())
 
 
 class FullScreenGrid:
-    def __init__(self, cell_size=10):
+    def __init__(self, cell_size=10, backend=None, renderer='image', sparse_density=SPARSE_DENSITY,
+                 grid_lines=True, target_ms=100):
         self.root = tk.Tk()
         self.root.title("Conway's Life")
         self.root.attributes("-fullscreen", False)
@@ -140,12 +444,53 @@ class FullScreenGrid:
         self.cols = self.screen_width // self.cell_size
         self.rows = self.screen_height // self.cell_size
 
-        self.grid = [[False] * self.cols for _ in range(self.rows)]
-        
-        self.cells = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.cells.append(Cell(row, col))
+        if backend is None:
+            backend = 'numba' if HAS_NUMBA else 'numpy'
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend in ('numba', 'packed') and not HAS_NUMBA:
+            raise ValueError(f"The '{backend}' backend requires Numba")
+        if backend == 'cupy' and not HAS_CUPY:
+            raise ValueError("The 'cupy' backend requires CuPy")
+        if backend == 'avx2' and not HAS_AVX2:
+            raise ValueError("The 'avx2' backend requires life_avx2 to be compiled")
+        self.backend = backend
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer: {renderer}")
+        self.renderer = renderer
+        self.sparse_density = sparse_density
+        self.grid_lines = grid_lines
+        self.target_ms = target_ms
+
+        shape = (self.rows + 2, self.cols + 2)
+        self.buffers = {}
+        if self.backend == 'python':
+            cells = bytearray(shape[0] * shape[1])
+            back_cells = bytearray(len(cells))
+            self.grid = np.frombuffer(cells, dtype=np.uint8).reshape(shape)
+            self.back = np.frombuffer(back_cells, dtype=np.uint8).reshape(shape)
+            self.buffers = {id(self.grid): cells, id(self.back): back_cells}
+        else:
+            self.grid = np.zeros(shape, dtype=np.uint8)
+            self.back = np.zeros_like(self.grid)
+        self.bits = None
+        self.new_bits = None
+        self.bits_stale = True
+        if self.backend in ('packed', 'avx2'):
+            self.bits = np.zeros(packed_shape(self.rows, self.cols), dtype=np.uint64)
+            self.new_bits = np.zeros_like(self.bits)
+        self.step_kernel = make_step(*self.grid.shape) if self.backend == 'numba' else None
+        self.active = np.ones(tile_shape(*self.grid.shape), dtype=np.bool_)
+        self.next_active = np.empty_like(self.active)
+        self.tile_delta = np.zeros(self.active.shape, dtype=np.int64)
+        if self.step_kernel is not None:
+            self.step_kernel(self.grid, self.back, self.active, self.next_active, self.tile_delta)
+        tracks_changes = self.backend in ('numba', 'packed', 'avx2')
+        self.change_buffer = np.empty(self.grid.size if tracks_changes else 0, dtype=np.int64)
+        self.live = None
+        self.population = 0
+        self.device_grid = None
+        self.device_back = None
 
         self.canvas = tk.Canvas(
             self.root, 
@@ -159,135 +504,235 @@ class FullScreenGrid:
 
         self.root.bind("<Escape>", lambda e: self.root.destroy())
 
-        self.cell_ids = {}
-        
+        self.photo = None
+        self.grid_photo = None
+        self.background = None
+        self.image_id = None
+        self.rect_ids = None
         self.draw_grid_lines()
+
+        if self.renderer == 'image':
+            self.photo = self.make_photo(self.background)
+            self.image_id = self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+
+        if self.renderer == 'rects':
+            self.create_cell_pool()
         
         self.create_random_pattern(density=0.3)
 
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.grid[row][col]:
-                    x = col * self.cell_size
-                    y = row * self.cell_size
-                    rect = self.canvas.create_rectangle(
-                        x, y, 
-                        x + self.cell_size, 
-                        y + self.cell_size, 
-                        fill='black', 
-                        outline='',
-                        width=0
-                    )
-                    self.cell_ids[(row, col)] = rect
+        self.render(np.flatnonzero(self.grid))
 
     def draw_grid_lines(self):
-        for i in range(0, self.screen_width, self.cell_size):
-            self.canvas.create_line(i, 0, i, self.screen_height, fill="gray", width=1)
-        for j in range(0, self.screen_height, self.cell_size):
-            self.canvas.create_line(0, j, self.screen_width, j, fill="gray", width=1)
-
-    def create_random_pattern(self, density=0.3):
+        width = self.cols * self.cell_size
+        height = self.rows * self.cell_size
+        self.background = np.full((height, width), 255, dtype=np.uint8)
+        if not self.grid_lines:
+            return
+        self.background[::self.cell_size, :] = _GRID_GRAY
+        self.background[:, ::self.cell_size] = _GRID_GRAY
+        if self.renderer == 'rects':
+            self.grid_photo = self.make_photo(self.background)
+            self.canvas.create_image(0, 0, anchor="nw", image=self.grid_photo)
+
+    def create_cell_pool(self):
+        self.rect_ids = np.zeros_like(self.grid, dtype=np.int64)
         for row in range(self.rows):
             for col in range(self.cols):
-                if random.random() < density:
-                    self.grid[row][col] = True
+                x = col * self.cell_size
+                y = row * self.cell_size
+                self.rect_ids[row + 1, col + 1] = self.canvas.create_rectangle(
+                    x, y, 
+                    x + self.cell_size, 
+                    y + self.cell_size, 
+                    fill='', 
+                    outline='',
+                    width=0
+                )
+
+    @property
+    def alive(self):
+        return self.grid[1:-1, 1:-1]
+
+    def create_random_pattern(self, density=0.3):
+        alive = self.alive
+        alive |= np.random.random((self.rows, self.cols)) < density
+        self.refresh_population()
 
     def load_pattern(self, pattern_name, start_row=0, start_col=0):
-        patterns = {
-            'glider': [(0,1), (1,2), (2,0), (2,1), (2,2)],
-            'blinker': [(0,0), (0,1), (0,2)],
-            'block': [(0,0), (0,1), (1,0), (1,1)],
-            'toad': [(0,1), (0,2), (0,3), (1,0), (1,1), (1,2)],
-            'spaceship': [(0,1), (0,4), (1,0), (2,0), (2,4), (3,0), (3,1), (3,2), (3,3)],
-            'beacon': [(0,0), (0,1), (1,0), (2,3), (3,2), (3,3)],
-            'pulsar': [
-                (0,2), (0,3), (0,4), (0,8), (0,9), (0,10),
-                (2,0), (2,5), (2,7), (2,12),
-                (3,0), (3,5), (3,7), (3,12),
-                (4,0), (4,5), (4,7), (4,12),
-                (5,2), (5,3), (5,4), (5,8), (5,9), (5,10),
-                (7,2), (7,3), (7,4), (7,8), (7,9), (7,10),
-                (8,0), (8,5), (8,7), (8,12),
-                (9,0), (9,5), (9,7), (9,12),
-                (10,0), (10,5), (10,7), (10,12),
-                (12,2), (12,3), (12,4), (12,8), (12,9), (12,10),
-            ],
-            'pentadecathlon': [
-                (0,2), (1,2), (2,1), (2,3), (3,2), (4,2), (5,2), (6,2), (7,1), (7,3), (8,2), (9,2)
-            ],
-            'glider_gun': [
-                (0,24), (1,22), (1,24), (2,12), (2,13), (2,20), (2,21), (2,34), (2,35),
-                (3,11), (3,15), (3,20), (3,21), (3,34), (3,35), (4,0), (4,1), (4,10),
-                (4,16), (4,20), (4,21), (5,0), (5,1), (5,10), (5,14), (5,16), (5,17),
-                (5,22), (5,24), (6,10), (6,16), (6,24), (7,11), (7,15), (8,12), (8,13)
-            ],
-        }
-        
-        if pattern_name in patterns:
-            for dr, dc in patterns[pattern_name]:
+        if pattern_name in _PATTERNS:
+            for dr, dc in _PATTERNS[pattern_name]:
                 row = start_row + dr
                 col = start_col + dc
                 if 0 <= row < self.rows and 0 <= col < self.cols:
-                    self.grid[row][col] = True
+                    self.alive[row, col] = 1
+            self.refresh_population()
 
-    def count_neighbors(self, row, col):
+    def refresh_population(self):
+        self.live = None
+        self.device_grid = None
+        self.bits_stale = True
+        self.active[...] = True
+        self.population = int(np.count_nonzero(self.grid))
+
+    def count_neighbors(self, cells, row, col):
         count = 0
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    if self.grid[nr][nc]:
-                        count += 1
+        width = self.cols + 2
+        for dr, dc in _NEIGHBORS:
+            count += cells[(row + dr) * width + col + dc]
         return count
 
-    def next_generation(self):
-        new_grid = [[False] * self.cols for _ in range(self.rows)]
+    def step(self, out):
+        if self.backend == 'numba':
+            self.step_kernel(self.grid, out, self.active, self.next_active, self.tile_delta)
+            self.active, self.next_active = self.next_active, self.active
+        elif self.backend == 'python':
+            width = self.cols + 2
+            cells = self.buffers[id(self.grid)]
+            new_cells = self.buffers[id(out)]
+            for row in range(1, self.rows + 1):
+                for col in range(1, self.cols + 1):
+                    idx = row * width + col
+                    neighbors = self.count_neighbors(cells, row, col)
+                    new_cells[idx] = (neighbors == 3) | (cells[idx] & (neighbors == 2))
+        else:
+            step_numpy(self.grid, out)
+
+    def step_sparse(self):
+        if self.live is None:
+            self.live = set(map(tuple, np.argwhere(self.alive).tolist()))
+        live = self.live
+
+        counts = defaultdict(int)
+        for row, col in live:
+            for dr, dc in _NEIGHBORS:
+                counts[(row + dr, col + dc)] += 1
+
+        rows, cols = self.rows, self.cols
+        new_live = {
+            (row, col) for (row, col), n in counts.items()
+            if (n == 3 or (n == 2 and (row, col) in live))
+            and 0 <= row < rows and 0 <= col < cols
+        }
+        width = cols + 2
+        alive = self.alive
         changes = []
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                neighbors = self.count_neighbors(row, col)
-                old_state = self.grid[row][col]
-                
-                if old_state:
-                    if neighbors == 2 or neighbors == 3:
-                        new_grid[row][col] = True
-                else:
-                    if neighbors == 3:
-                        new_grid[row][col] = True
-                
-                if old_state != new_grid[row][col]:
-                    changes.append((row, col, new_grid[row][col]))
-        
-        self.grid = new_grid
-        
-        for row, col, alive in changes:
-            idx = row * self.cols + col
-            self.cells[idx].alive = alive
-            
-            if alive:
-                if (row, col) not in self.cell_ids:
-                    x = col * self.cell_size
-                    y = row * self.cell_size
-                    rect = self.canvas.create_rectangle(
-                        x, y, 
-                        x + self.cell_size, 
-                        y + self.cell_size, 
-                        fill='black', 
-                        outline='',
-                        width=0
-                    )
-                    self.cell_ids[(row, col)] = rect
+        for row, col in live ^ new_live:
+            alive[row, col] ^= 1
+            changes.append((row + 1) * width + col + 1)
+
+        self.live = new_live
+        self.population = len(new_live)
+        self.device_grid = None
+        self.bits_stale = True
+        self.active[...] = True
+        return changes
+
+    def step_device(self):
+        if self.device_grid is None:
+            self.device_grid = cp.asarray(self.grid)
+            self.device_back = cp.zeros_like(self.device_grid)
+        step_numpy(self.device_grid, self.device_back)
+        changes = cp.flatnonzero(self.device_back ^ self.device_grid).get()
+        self.device_grid, self.device_back = self.device_back, self.device_grid
+
+        self.grid.ravel()[changes] ^= 1
+        self.population = int(cp.count_nonzero(self.device_grid))
+        return changes
+
+    def step_bits(self):
+        if self.bits_stale:
+            pack_grid(self.grid, self.bits)
+            self.bits_stale = False
+        if self.backend == 'avx2':
+            step_avx2(self.bits, self.new_bits, self.cols)
+            count, delta = apply_word_diff_avx2(self.new_bits, self.bits, self.grid, self.change_buffer)
+        else:
+            step_packed(self.bits, self.new_bits, self.cols)
+            count, delta = apply_word_diff(self.new_bits, self.bits, self.grid, self.change_buffer)
+        self.bits, self.new_bits = self.new_bits, self.bits
+
+        self.population += int(delta)
+        return self.change_buffer[:count]
+
+    def use_sparse(self):
+        threshold = self.sparse_density * self.rows * self.cols
+        if self.live is None:
+            return self.population < _SPARSE_ENTER * threshold
+        return self.population <= threshold
+
+    def next_generation(self):
+        if self.use_sparse():
+            changes = self.step_sparse()
+        elif self.backend == 'cupy':
+            self.live = None
+            changes = self.step_device()
+        elif self.backend in ('packed', 'avx2'):
+            self.live = None
+            changes = self.step_bits()
+        else:
+            self.live = None
+            self.step(self.back)
+            if self.backend == 'numba':
+                count = collect_changes(self.back, self.grid, self.active, self.change_buffer)
+                changes = self.change_buffer[:count]
+                self.population += int(self.tile_delta.sum())
             else:
-                if (row, col) in self.cell_ids:
-                    self.canvas.delete(self.cell_ids[(row, col)])
-                    del self.cell_ids[(row, col)]
+                changes = np.flatnonzero(self.back ^ self.grid)
+                self.population = int(np.count_nonzero(self.back))
+            
+            self.grid, self.back = self.back, self.grid
+        
+        self.render(changes)
+
+    def render(self, changes):
+        if len(changes) == 0:
+            return
+        if self.renderer == 'rects':
+            cells = self.grid.ravel()
+            rect_ids = self.rect_ids.ravel()
+            for idx in changes:
+                fill = 'black' if cells[idx] else ''
+                self.canvas.itemconfig(int(rect_ids[idx]), fill=fill)
+        else:
+            self.blit_tiles(np.asarray(changes))
+
+        self.canvas.update_idletasks()
+
+    def blit_tiles(self, changes):
+        width = self.cols + 2
+        tile_cols = self.active.shape[1]
+        rows = changes // width - 1
+        cols = changes % width - 1
+        tiles = np.unique((rows // _TILE_ROWS) * tile_cols + cols // _TILE_COLS)
+        if 2 * len(tiles) > self.active.size:
+            self.blit(0, self.rows, 0, self.cols)
+            return
+        for tile in tiles.tolist():
+            tile_row, tile_col = divmod(tile, tile_cols)
+            row_start = tile_row * _TILE_ROWS
+            col_start = tile_col * _TILE_COLS
+            self.blit(row_start, min(row_start + _TILE_ROWS, self.rows),
+                      col_start, min(col_start + _TILE_COLS, self.cols))
+
+    def blit(self, row_start, row_end, col_start, col_end):
+        size = self.cell_size
+        pixels = self.alive[row_start:row_end, col_start:col_end].repeat(size, axis=0).repeat(size, axis=1)
+        background = self.background[row_start * size:row_end * size, col_start * size:col_end * size]
+        image = np.where(pixels, 0, background).astype(np.uint8, copy=False)
+        self.photo.put(ppm_data(image), to=(col_start * size, row_start * size))
+
+    def make_photo(self, image):
+        return tk.PhotoImage(data=ppm_data(image), format="PPM")
 
     def loop(self):
+        start = time.perf_counter()
         self.next_generation()
-        self.root.after(100, self.loop)
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        delay = self.target_ms - elapsed_ms
+        if delay > 0:
+            self.root.after(delay, self.loop)
+        else:
+            self.root.after_idle(self.loop)
 
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,186 @@
+/*
+ * Passo do Jogo da Vida sobre linhas empacotadas em bits (64 células por
+ * uint64, bit j da palavra w = coluna 64*w + j), com o mesmo layout de
+ * pack_grid() em game.py. Fora do grid todas as células são mortas.
+ *
+ * apply_diff() escreve de volta no grid uint8 com borda de zeros
+ * (rows+2 x cols+2) usado por game.py apenas as células das palavras que
+ * mudaram entre duas gerações.
+ *
+ * Compilação:
+ *     gcc -O3 -mavx2 -shared -fPIC -o life_avx2.so life_avx2.c
+ *     gcc -O3 -mavx2 -shared -o life_avx2.dll life_avx2.c   (Windows)
+ *
+ * Sem -mavx2 o arquivo compila apenas o caminho escalar.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __AVX2__
+#include <immintrin.h>
+#endif
+
+#ifdef _WIN32
+#define EXPORT __declspec(dllexport)
+#else
+#define EXPORT
+#endif
+
+/* row == NULL representa uma linha fora do grid (todas as células mortas). */
+static inline uint64_t word_at(const uint64_t *row, int i, int words)
+{
+    return (row != NULL && i >= 0 && i < words) ? row[i] : 0;
+}
+
+static inline int lowest_bit(uint64_t x)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    return __builtin_ctzll(x);
+#else
+    int bit = 0;
+    while (!(x & 1)) {
+        x >>= 1;
+        bit++;
+    }
+    return bit;
+#endif
+}
+
+static inline void full_add(uint64_t x, uint64_t y, uint64_t z, uint64_t *sum, uint64_t *carry)
+{
+    uint64_t partial = x ^ y;
+    *sum = partial ^ z;
+    *carry = (x & y) | (z & partial);
+}
+
+static void step_word(const uint64_t *above, const uint64_t *row, const uint64_t *below,
+                      uint64_t *out, int i, int words)
+{
+    uint64_t a = word_at(above, i, words), b = row[i], c = word_at(below, i, words);
+    uint64_t aw = (a << 1) | (word_at(above, i - 1, words) >> 63);
+    uint64_t ae = (a >> 1) | (word_at(above, i + 1, words) << 63);
+    uint64_t bw = (b << 1) | (word_at(row, i - 1, words) >> 63);
+    uint64_t be = (b >> 1) | (word_at(row, i + 1, words) << 63);
+    uint64_t cw = (c << 1) | (word_at(below, i - 1, words) >> 63);
+    uint64_t ce = (c >> 1) | (word_at(below, i + 1, words) << 63);
+
+    uint64_t sum_a, carry_a, sum_c, carry_c, ones, carry_1, partial, carry_2;
+    full_add(aw, a, ae, &sum_a, &carry_a);
+    full_add(cw, c, ce, &sum_c, &carry_c);
+    uint64_t sum_b = bw ^ be;
+    uint64_t carry_b = bw & be;
+
+    full_add(sum_a, sum_b, sum_c, &ones, &carry_1);
+    full_add(carry_a, carry_b, carry_c, &partial, &carry_2);
+    uint64_t twos = partial ^ carry_1;
+    uint64_t fours = carry_2 | (partial & carry_1);
+
+    out[i] = twos & ~fours & (ones | b);
+}
+
+#ifdef __AVX2__
+static inline __m256i load(const uint64_t *p)
+{
+    return _mm256_loadu_si256((const __m256i *)p);
+}
+
+static inline void full_add_256(__m256i x, __m256i y, __m256i z, __m256i *sum, __m256i *carry)
+{
+    __m256i partial = _mm256_xor_si256(x, y);
+    *sum = _mm256_xor_si256(partial, z);
+    *carry = _mm256_or_si256(_mm256_and_si256(x, y), _mm256_and_si256(z, partial));
+}
+
+/* Vizinhos oeste/leste de 4 palavras: as cargas desalinhadas em i-1 e i+1
+ * trazem o bit de fronteira de cada palavra vizinha. */
+static inline void shifted(const uint64_t *row, int i, __m256i *west, __m256i *mid, __m256i *east)
+{
+    if (row == NULL) {
+        *west = *mid = *east = _mm256_setzero_si256();
+        return;
+    }
+    *mid = load(row + i);
+    *west = _mm256_or_si256(_mm256_slli_epi64(*mid, 1), _mm256_srli_epi64(load(row + i - 1), 63));
+    *east = _mm256_or_si256(_mm256_srli_epi64(*mid, 1), _mm256_slli_epi64(load(row + i + 1), 63));
+}
+
+static void step_block(const uint64_t *above, const uint64_t *row, const uint64_t *below,
+                       uint64_t *out, int i)
+{
+    __m256i aw, a, ae, bw, b, be, cw, c, ce;
+    shifted(above, i, &aw, &a, &ae);
+    shifted(row, i, &bw, &b, &be);
+    shifted(below, i, &cw, &c, &ce);
+
+    __m256i sum_a, carry_a, sum_c, carry_c, ones, carry_1, partial, carry_2;
+    full_add_256(aw, a, ae, &sum_a, &carry_a);
+    full_add_256(cw, c, ce, &sum_c, &carry_c);
+    __m256i sum_b = _mm256_xor_si256(bw, be);
+    __m256i carry_b = _mm256_and_si256(bw, be);
+
+    full_add_256(sum_a, sum_b, sum_c, &ones, &carry_1);
+    full_add_256(carry_a, carry_b, carry_c, &partial, &carry_2);
+    __m256i twos = _mm256_xor_si256(partial, carry_1);
+    __m256i fours = _mm256_or_si256(carry_2, _mm256_and_si256(partial, carry_1));
+
+    __m256i next = _mm256_andnot_si256(fours, _mm256_and_si256(twos, _mm256_or_si256(ones, b)));
+    _mm256_storeu_si256((__m256i *)(out + i), next);
+}
+#endif
+
+EXPORT int step_avx2(const uint64_t *in, uint64_t *out, int words_per_row, int rows)
+{
+    int words = words_per_row;
+    if (in == NULL || out == NULL || words <= 0 || rows < 0)
+        return -1;
+
+    for (int r = 0; r < rows; r++) {
+        const uint64_t *row = in + (size_t)r * words;
+        const uint64_t *above = r > 0 ? row - words : NULL;
+        const uint64_t *below = r + 1 < rows ? row + words : NULL;
+        uint64_t *dst = out + (size_t)r * words;
+        int i = 0;
+
+        step_word(above, row, below, dst, i++, words);
+#ifdef __AVX2__
+        for (; i + 5 <= words; i += 4)
+            step_block(above, row, below, dst, i);
+#endif
+        for (; i < words; i++)
+            step_word(above, row, below, dst, i, words);
+    }
+
+    return 0;
+}
+
+/* Percorre new ^ old palavra a palavra: grava no grid só as células que
+ * mudaram, guarda seus índices lineares em changes (capacidade rows*words*64)
+ * e soma em *delta a variação da população. Devolve o número de mudanças. */
+EXPORT int64_t apply_diff(const uint64_t *new_bits, const uint64_t *old_bits, uint8_t *grid,
+                          int64_t *changes, int words, int rows, int cols, int64_t *delta)
+{
+    if (new_bits == NULL || old_bits == NULL || grid == NULL || changes == NULL || delta == NULL
+            || words <= 0 || rows < 0 || cols < 0)
+        return -1;
+
+    int64_t width = (int64_t)cols + 2;
+    int64_t count = 0, sum = 0;
+    for (int r = 0; r < rows; r++) {
+        for (int w = 0; w < words; w++) {
+            size_t i = (size_t)r * words + w;
+            uint64_t diff = new_bits[i] ^ old_bits[i];
+            int64_t base = (r + 1) * width + (int64_t)w * 64 + 1;
+            while (diff) {
+                int bit = lowest_bit(diff);
+                uint8_t alive = (uint8_t)((new_bits[i] >> bit) & 1);
+                grid[base + bit] = alive;
+                changes[count++] = base + bit;
+                sum += alive ? 1 : -1;
+                diff &= diff - 1;
+            }
+        }
+    }
+
+    *delta = sum;
+    return count;
+}